@@ -1,6 +1,12 @@
 
 import hashlib
-from typing import List, Optional
+from typing import Callable, List, Optional
+
+try:
+    import blake3
+    BLAKE3_AVAILABLE = True
+except ImportError:
+    BLAKE3_AVAILABLE = False
 
 class HashComputer:
     
@@ -22,24 +28,34 @@ class HashComputer:
         return HashComputer.hash_string(serialized)
     
     @staticmethod
-    def compute_merkle_root(hashes: List[str]) -> str:
+    def _hex_digest(algo: str) -> Callable[[bytes], str]:
+        if algo == "sha256":
+            sha256 = hashlib.sha256
+            return lambda data: sha256(data).hexdigest()
+        if algo == "blake3":
+            if not BLAKE3_AVAILABLE:
+                raise ValueError("blake3 hashing requested but the blake3 package is not installed")
+            return lambda data: blake3.blake3(data).hexdigest()
+        raise ValueError(f"Unsupported hash algorithm: {algo}")
+    
+    @staticmethod
+    def compute_merkle_root(hashes: List[str], algo: Optional[str] = None) -> str:
+        digest = HashComputer._hex_digest(algo or HashComputer.ALGORITHM)
+        
         if not hashes:
-            return HashComputer.hash_string("")
+            return digest(b"")
         
         if len(hashes) == 1:
             return hashes[0]
         
-        if len(hashes) % 2 == 1:
-            hashes = hashes + [hashes[-1]]
-        
-        while len(hashes) > 1:
-            next_level = []
-            for i in range(0, len(hashes), 2):
-                combined = hashes[i] + hashes[i + 1]
-                next_level.append(HashComputer.hash_string(combined))
-            hashes = next_level
+        level = list(hashes)
+        while len(level) > 1:
+            if len(level) % 2 == 1:
+                level.append(level[-1])
+            pairs = iter(level)
+            level = [digest((left + right).encode("utf-8")) for left, right in zip(pairs, pairs)]
         
-        return hashes[0]
+        return level[0]
     
     @staticmethod
     def compute_batch_hash(
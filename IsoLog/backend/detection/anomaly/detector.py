@@ -1,6 +1,8 @@
 
 import logging
+import os
 import pickle
+import tempfile
 from datetime import datetime
 from pathlib import Path
 from typing import Any, Dict, List, Optional
@@ -55,12 +57,19 @@ class AnomalyDetector:
             return
         
         model_file = self.models_path / "isolation_forest.pkl"
-        with open(model_file, "wb") as f:
-            pickle.dump({
-                "model": self.model,
-                "feature_names": self._feature_names,
-                "trained_at": datetime.utcnow().isoformat(),
-            }, f)
+        # Concurrent trainers (e.g. validator workers) may save at once; replace atomically
+        fd, tmp_path = tempfile.mkstemp(dir=self.models_path, prefix=".isolation_forest.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                pickle.dump({
+                    "model": self.model,
+                    "feature_names": self._feature_names,
+                    "trained_at": datetime.utcnow().isoformat(),
+                }, f)
+            os.replace(tmp_path, model_file)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
         
         logger.info(f"Saved anomaly detection model to {model_file}")
     
@@ -78,22 +87,48 @@ class AnomalyDetector:
         score = self._calculate_anomaly_score(features)
         
         if score >= self.threshold:
-            return Detection(
-                rule_id="ml_anomaly",
-                rule_name="ML Anomaly Detection",
-                rule_description="Event detected as anomalous by machine learning model",
-                severity=self._score_to_severity(score),
-                detection_type="ml",
-                confidence=min(score, 1.0),
-                details={
-                    "anomaly_score": round(score, 4),
-                    "threshold": self.threshold,
-                    "feature_contributions": self._get_feature_contributions(features),
-                },
-            )
+            return self._create_detection(score, features)
         
         return None
     
+    async def detect_batch(self, events: List[ParsedEvent]) -> List[Optional[Detection]]:
+        results: List[Optional[Detection]] = [None] * len(events)
+        pending = []
+        
+        for i, event in enumerate(events):
+            features = self._extract_features(event)
+            self._event_buffer.append(features)
+            
+            if not self._is_trained and len(self._event_buffer) >= self._min_training_samples:
+                await self._train_model()
+            
+            if self._is_trained:
+                pending.append((i, features))
+        
+        if pending:
+            # One decision_function call over the whole feature matrix instead of one per event
+            scores = self._calculate_anomaly_scores([features for _, features in pending])
+            for (i, features), score in zip(pending, scores):
+                if score >= self.threshold:
+                    results[i] = self._create_detection(score, features)
+        
+        return results
+    
+    def _create_detection(self, score: float, features: Dict[str, float]) -> Detection:
+        return Detection(
+            rule_id="ml_anomaly",
+            rule_name="ML Anomaly Detection",
+            rule_description="Event detected as anomalous by machine learning model",
+            severity=self._score_to_severity(score),
+            detection_type="ml",
+            confidence=min(score, 1.0),
+            details={
+                "anomaly_score": round(score, 4),
+                "threshold": self.threshold,
+                "feature_contributions": self._get_feature_contributions(features),
+            },
+        )
+    
     def _extract_features(self, event: ParsedEvent) -> Dict[str, float]:
         features = {}
         
@@ -165,16 +200,20 @@ class AnomalyDetector:
         logger.info("Anomaly detection model trained successfully")
     
     def _calculate_anomaly_score(self, features: Dict[str, float]) -> float:
+        return self._calculate_anomaly_scores([features])[0]
+    
+    def _calculate_anomaly_scores(self, samples: List[Dict[str, float]]) -> List[float]:
         if not self.model or not self._feature_names:
-            return 0.0
-        
-        X = np.array([[features.get(fname, 0.0) for fname in self._feature_names]])
+            return [0.0] * len(samples)
         
-        raw_score = self.model.decision_function(X)[0]
+        X = np.array([
+            [features.get(fname, 0.0) for fname in self._feature_names]
+            for features in samples
+        ])
         
-        normalized_score = max(0.0, min(1.0, 0.5 - raw_score))
+        raw_scores = self.model.decision_function(X)
         
-        return normalized_score
+        return np.clip(0.5 - raw_scores, 0.0, 1.0).tolist()
     
     def _score_to_severity(self, score: float) -> str:
         if score >= 0.95:
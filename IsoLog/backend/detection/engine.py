@@ -47,8 +47,9 @@ class Detection:
 
 class DetectionEngine:
     
-    def __init__(self):
+    def __init__(self, rule_cache_path: Optional[str] = None):
         self.settings = get_settings()
+        self.rule_cache_path = rule_cache_path
         
         self._sigma_matcher = None
         self._mitre_mapper = None
@@ -68,7 +69,8 @@ class DetectionEngine:
             self._sigma_matcher = SigmaMatcher(
                 rules_path=str(self.settings.resolve_path(
                     self.settings.detection.sigma.rules_path
-                ))
+                )),
+                cache_path=self.rule_cache_path,
             )
             await self._sigma_matcher.load_rules()
             logger.info(f"Loaded {self._sigma_matcher.rule_count} Sigma rules")
@@ -106,36 +108,40 @@ class DetectionEngine:
         logger.info("Detection engine initialized")
     
     async def analyze(self, event: ParsedEvent) -> List[Detection]:
+        return (await self.analyze_events([event]))[0]
+    
+    async def analyze_events(self, events: List[ParsedEvent]) -> List[List[Detection]]:
         if not self._initialized:
             await self.initialize()
         
-        detections: List[Detection] = []
+        results: List[List[Detection]] = [[] for _ in events]
         
         if self._sigma_matcher:
-            sigma_detections = await self._sigma_matcher.match(event)
-            detections.extend(sigma_detections)
+            for event, detections in zip(events, results):
+                detections.extend(await self._sigma_matcher.match(event))
         
         if self._anomaly_detector:
-            anomaly_detection = await self._anomaly_detector.detect(event)
-            if anomaly_detection:
-                detections.append(anomaly_detection)
+            anomaly_detections = await self._anomaly_detector.detect_batch(events)
+            for detections, anomaly_detection in zip(results, anomaly_detections):
+                if anomaly_detection:
+                    detections.append(anomaly_detection)
+        
+        for detections in results:
+            if self._mitre_mapper:
+                for detection in detections:
+                    self._mitre_mapper.enrich_detection(detection)
+            
+            if self._scorer:
+                for detection in detections:
+                    self._scorer.score(detection)
         
-        if self._mitre_mapper:
-            for detection in detections:
-                self._mitre_mapper.enrich_detection(detection)
-        
-        if self._scorer:
-            for detection in detections:
-                self._scorer.score(detection)
-        
-        return detections
+        return results
     
     async def analyze_batch(self, events: List[ParsedEvent]) -> Dict[str, List[Detection]]:
         results = {}
-        for event in events:
-            event_id = event.extra.get("id") or id(event)
-            detections = await self.analyze(event)
+        for event, detections in zip(events, await self.analyze_events(events)):
             if detections:
+                event_id = event.extra.get("id") or id(event)
                 results[event_id] = detections
         return results
     
@@ -1,7 +1,9 @@
 import logging
 import os
+import pickle
+import tempfile
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 from ruamel.yaml import YAML
 
@@ -10,10 +12,13 @@ from ...parsers.base_parser import ParsedEvent
 
 logger = logging.getLogger(__name__)
 
+RULE_CACHE_VERSION = 1
+
 class SigmaMatcher:
     
-    def __init__(self, rules_path: str):
+    def __init__(self, rules_path: str, cache_path: Optional[str] = None):
         self.rules_path = Path(rules_path)
+        self.cache_path = Path(cache_path) if cache_path else None
         self.rules: List[Dict[str, Any]] = []
         self._yaml = YAML()
         self._yaml.preserve_quotes = True
@@ -33,6 +38,15 @@ class SigmaMatcher:
         yaml_files = list(self.rules_path.rglob("*.yml"))
         yaml_files.extend(self.rules_path.rglob("*.yaml"))
         
+        cache_key = None
+        if self.cache_path:
+            cache_key = self._cache_key(yaml_files)
+            cached = self._read_cache(cache_key)
+            if cached is not None:
+                self.rules = cached
+                logger.info(f"Loaded {len(self.rules)} Sigma rules from cache {self.cache_path}")
+                return
+        
         for rule_file in yaml_files:
             try:
                 rule = self._load_rule_file(rule_file)
@@ -41,8 +55,47 @@ class SigmaMatcher:
             except Exception as e:
                 logger.warning(f"Failed to load rule {rule_file}: {e}")
         
+        if self.cache_path:
+            self._write_cache(cache_key)
+        
         logger.info(f"Loaded {len(self.rules)} Sigma rules")
     
+    def _cache_key(self, yaml_files: List[Path]) -> Tuple:
+        # Any added, removed or edited rule file changes the key
+        stamps = []
+        for rule_file in sorted(yaml_files):
+            st = rule_file.stat()
+            stamps.append((str(rule_file), st.st_mtime_ns, st.st_size))
+        return (RULE_CACHE_VERSION, str(self.rules_path.resolve()), tuple(stamps))
+    
+    def _read_cache(self, cache_key: Tuple) -> Optional[List[Dict[str, Any]]]:
+        try:
+            with open(self.cache_path, "rb") as f:
+                cached = pickle.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable Sigma rule cache {self.cache_path}: {e}")
+            return None
+        
+        if not isinstance(cached, dict) or cached.get("key") != cache_key:
+            return None
+        return cached.get("rules")
+    
+    def _write_cache(self, cache_key: Tuple):
+        try:
+            self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.cache_path.parent, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    pickle.dump({"key": cache_key, "rules": self.rules}, f, protocol=pickle.HIGHEST_PROTOCOL)
+                os.replace(tmp_path, self.cache_path)
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
+        except Exception as e:
+            logger.warning(f"Could not write Sigma rule cache {self.cache_path}: {e}")
+    
     def _load_rule_file(self, path: Path) -> Optional[Dict[str, Any]]:
         with open(path, "r", encoding="utf-8") as f:
             content = f.read()
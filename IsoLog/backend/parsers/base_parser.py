@@ -5,6 +5,9 @@ from datetime import datetime
 from typing import Any, Dict, List, Optional, Pattern
 import re
 
+_IP_RE = re.compile(r'\b(?:\d{1,3}\.){3}\d{1,3}\b')
+_PORT_RE = re.compile(r':(\d{1,5})\b')
+
 @dataclass
 class ParsedEvent:
     timestamp: datetime
@@ -123,13 +126,11 @@ class BaseParser(ABC):
         return self._compiled_patterns[name]
     
     def _extract_ip(self, text: str) -> Optional[str]:
-        ip_pattern = r'\b(?:\d{1,3}\.){3}\d{1,3}\b'
-        match = re.search(ip_pattern, text)
+        match = _IP_RE.search(text)
         return match.group(0) if match else None
     
     def _extract_port(self, text: str) -> Optional[int]:
-        port_pattern = r':(\d{1,5})\b'
-        match = re.search(port_pattern, text)
+        match = _PORT_RE.search(text)
         if match:
             port = int(match.group(1))
             if 0 < port <= 65535:
@@ -5,6 +5,8 @@ from typing import Optional
 
 from ..base_parser import BaseParser, ParsedEvent
 
+_IPV4_RE = re.compile(r'\d+\.\d+\.\d+\.\d+')
+
 class FirewallParser(BaseParser):
     
     parser_id = "firewall"
@@ -39,11 +41,9 @@ class FirewallParser(BaseParser):
     
     KV_PATTERN = r'(\w+)=([^\s]+)'
     
-    def __init__(self):
-        super().__init__()
-        self._iptables = re.compile(self.IPTABLES_PATTERN, re.IGNORECASE)
-        self._windows_fw = re.compile(self.WINDOWS_FW_PATTERN)
-        self._kv = re.compile(self.KV_PATTERN)
+    _iptables = re.compile(IPTABLES_PATTERN, re.IGNORECASE)
+    _windows_fw = re.compile(WINDOWS_FW_PATTERN)
+    _kv = re.compile(KV_PATTERN)
     
     def can_parse(self, raw_log: str) -> bool:
         raw_log_upper = raw_log.upper()
@@ -52,7 +52,7 @@ class FirewallParser(BaseParser):
             return True
         
         if 'DROP' in raw_log_upper or 'ALLOW' in raw_log_upper:
-            if re.search(r'\d+\.\d+\.\d+\.\d+', raw_log):
+            if _IPV4_RE.search(raw_log):
                 return True
         
         firewall_keywords = ['BLOCKED', 'PERMITTED', 'DENIED', 'ACCEPTED', 'FIREWALL']
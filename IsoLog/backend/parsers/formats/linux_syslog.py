@@ -38,14 +38,12 @@ class LinuxSyslogParser(BaseParser):
     
     SUDO_PATTERN = r'(\S+)\s*:\s*.*COMMAND=(.+)$'
     
-    def __init__(self):
-        super().__init__()
-        self._rfc3164 = re.compile(self.RFC3164_PATTERN)
-        self._rfc5424 = re.compile(self.RFC5424_PATTERN)
-        self._ssh_accepted = re.compile(self.SSH_ACCEPTED)
-        self._ssh_failed = re.compile(self.SSH_FAILED)
-        self._ssh_invalid = re.compile(self.SSH_INVALID)
-        self._sudo = re.compile(self.SUDO_PATTERN)
+    _rfc3164 = re.compile(RFC3164_PATTERN)
+    _rfc5424 = re.compile(RFC5424_PATTERN)
+    _ssh_accepted = re.compile(SSH_ACCEPTED)
+    _ssh_failed = re.compile(SSH_FAILED)
+    _ssh_invalid = re.compile(SSH_INVALID)
+    _sudo = re.compile(SUDO_PATTERN)
     
     def can_parse(self, raw_log: str) -> bool:
         if raw_log.startswith('<') and raw_log[1:4].replace('>', '').isdigit():
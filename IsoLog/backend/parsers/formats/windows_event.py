@@ -6,6 +6,12 @@ from typing import Optional
 
 from ..base_parser import BaseParser, ParsedEvent
 
+_TEXT_EVENT_ID_RE = re.compile(r'Event\s*ID:?\s*(\d+)', re.IGNORECASE)
+_XML_EVENT_ID_RE = re.compile(r'<EventID[^>]*>(\d+)</EventID>')
+_XML_SYSTEM_TIME_RE = re.compile(r'SystemTime=["\']([^"\']+)["\']')
+_XML_COMPUTER_RE = re.compile(r'<Computer>([^<]+)</Computer>')
+_TEXT_TIMESTAMP_RE = re.compile(r'(\d{4}[-/]\d{2}[-/]\d{2}\s+\d{2}:\d{2}:\d{2})')
+
 class WindowsEventParser(BaseParser):
     
     parser_id = "windows_event"
@@ -47,7 +53,7 @@ class WindowsEventParser(BaseParser):
         if raw_log.startswith('{') and '"EventID"' in raw_log:
             return True
         
-        if re.search(r'Event\s*ID:?\s*\d+', raw_log, re.IGNORECASE):
+        if _TEXT_EVENT_ID_RE.search(raw_log):
             return True
         
         return False
@@ -143,12 +149,12 @@ class WindowsEventParser(BaseParser):
     def _parse_xml(self, raw_log: str) -> Optional[ParsedEvent]:
         
         event_id = None
-        match = re.search(r'<EventID[^>]*>(\d+)</EventID>', raw_log)
+        match = _XML_EVENT_ID_RE.search(raw_log)
         if match:
             event_id = int(match.group(1))
         
         timestamp = datetime.utcnow()
-        match = re.search(r'SystemTime=["\']([^"\']+)["\']', raw_log)
+        match = _XML_SYSTEM_TIME_RE.search(raw_log)
         if match:
             try:
                 timestamp = datetime.fromisoformat(match.group(1).replace("Z", "+00:00"))
@@ -156,7 +162,7 @@ class WindowsEventParser(BaseParser):
                 pass
         
         computer = None
-        match = re.search(r'<Computer>([^<]+)</Computer>', raw_log)
+        match = _XML_COMPUTER_RE.search(raw_log)
         if match:
             computer = match.group(1)
         
@@ -181,12 +187,12 @@ class WindowsEventParser(BaseParser):
     
     def _parse_text(self, raw_log: str) -> Optional[ParsedEvent]:
         event_id = None
-        match = re.search(r'Event\s*ID:?\s*(\d+)', raw_log, re.IGNORECASE)
+        match = _TEXT_EVENT_ID_RE.search(raw_log)
         if match:
             event_id = int(match.group(1))
         
         timestamp = datetime.utcnow()
-        match = re.search(r'(\d{4}[-/]\d{2}[-/]\d{2}\s+\d{2}:\d{2}:\d{2})', raw_log)
+        match = _TEXT_TIMESTAMP_RE.search(raw_log)
         if match:
             try:
                 timestamp = datetime.strptime(match.group(1), "%Y-%m-%d %H:%M:%S")
@@ -1,16 +1,67 @@
 
+import errno
+import filecmp
 import json
 import logging
+import os
 import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 from .bundle import UpdateBundle
 from .verifier import UpdateVerifier
 
 logger = logging.getLogger(__name__)
 
+_manifest_cache: Dict[tuple, Dict[str, Any]] = {}
+
+def _copytree(src: Path, dst: Path):
+    if sys.platform == "win32":
+        try:
+            proc = subprocess.run(
+                ["robocopy", str(src), str(dst), "/E", "/NFL", "/NDL", "/NP", "/MT:16"],
+                check=False,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+            )
+            # robocopy exit codes 0 and 1 mean "nothing to copy" and "files copied"
+            if proc.returncode <= 1:
+                return
+        except OSError:
+            pass
+        shutil.copytree(src, dst, dirs_exist_ok=True)
+        return
+    
+    shutil.copytree(src, dst)
+
+def _link_or_copy(src: str, dst: str):
+    try:
+        os.link(src, dst)
+    except OSError as e:
+        if e.errno not in (errno.EXDEV, errno.EPERM):
+            raise
+        shutil.copy2(src, dst)
+
+def _linktree(src: Path, dst: Path):
+    # Hardlinked backups are only safe for trees whose every writer goes through
+    # _replace_file; an in-place write to a shared inode would rewrite the backup.
+    shutil.copytree(src, dst, copy_function=_link_or_copy)
+
+def _replace_file(src: Path, target: Path):
+    # Copying over an existing file truncates its inode in place, which would
+    # also rewrite any hardlinked backup of it
+    try:
+        os.unlink(target)
+    except FileNotFoundError:
+        pass
+    shutil.copy2(src, target)
+
 class UpdateManager:
     
     def __init__(
@@ -23,10 +74,19 @@ class UpdateManager:
         self.rules_path = Path(rules_path)
         self.models_path = Path(models_path)
         self.backup_path = Path(backup_path)
+        self.mitre_path = self.rules_path.parent / "mitre"
+        self.intel_path = self.rules_path.parent / "intel"
         self.public_key_path = public_key_path
         
         self.verifier = UpdateVerifier(public_key_path)
         self._update_history: List[Dict[str, Any]] = []
+        
+        self._appliers = {
+            "sigma_rules": self._apply_sigma_rules,
+            "models": self._apply_models,
+            "mitre": self._apply_mitre_data,
+            "intel": self._apply_intel_data,
+        }
     
     def apply_update(
         self,
@@ -41,43 +101,64 @@ class UpdateManager:
             "backup_path": None,
         }
         
-        if not skip_verification:
-            verify_result = self.verifier.verify_bundle(bundle_path)
-            if not verify_result["valid"]:
-                result["error"] = f"Verification failed: {verify_result.get('errors', [])}"
-                return result
-            result["verification"] = verify_result
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            fut_verify = None
+            if not skip_verification:
+                fut_verify = executor.submit(self.verifier.verify_bundle, bundle_path)
+            
+            backup_result = self._create_backup() if create_backup else {}
+            
+            if fut_verify is not None:
+                verify_result = fut_verify.result()
+                if not verify_result["valid"]:
+                    self._discard_backup(backup_result.get("path"))
+                    result["error"] = f"Verification failed: {verify_result.get('errors', [])}"
+                    return result
+                result["verification"] = verify_result
         
-        if create_backup:
-            backup_result = self._create_backup()
-            result["backup_path"] = backup_result.get("path")
+        result["backup_path"] = backup_result.get("path")
         
         try:
             bundle = UpdateBundle(bundle_path)
-            import tempfile
             with tempfile.TemporaryDirectory() as temp_dir:
                 manifest = bundle.extract(temp_dir)
                 extracted_path = Path(manifest["extracted_to"])
                 
-                for content in manifest.get("contents", []):
-                    content_type = content["type"]
-                    content_path = extracted_path / content["path"]
-                    
-                    if content_type == "sigma_rules":
-                        change = self._apply_sigma_rules(content_path)
-                        result["changes"].append(change)
-                    
-                    elif content_type == "models":
-                        change = self._apply_models(content_path)
-                        result["changes"].append(change)
-                    
-                    elif content_type == "mitre":
-                        change = self._apply_mitre_data(content_path)
-                        result["changes"].append(change)
-                    
-                    elif content_type == "intel":
-                        change = self._apply_intel_data(content_path)
-                        result["changes"].append(change)
+                sources_by_type: Dict[str, List[Tuple[int, Path]]] = {}
+                for index, content in enumerate(manifest.get("contents", [])):
+                    if content["type"] in self._appliers:
+                        sources_by_type.setdefault(content["type"], []).append(
+                            (index, extracted_path / content["path"])
+                        )
+                
+                # Each applier writes to its own directory, so different types run
+                # concurrently; entries of one type run in order on a single thread
+                failed = threading.Event()
+                
+                def apply_type(
+                    content_type: str, sources: List[Tuple[int, Path]]
+                ) -> List[Tuple[int, Dict[str, Any]]]:
+                    changes = []
+                    for index, source in sources:
+                        if failed.is_set():
+                            break
+                        try:
+                            changes.append((index, self._appliers[content_type](source)))
+                        except Exception:
+                            failed.set()
+                            raise
+                    return changes
+                
+                if sources_by_type:
+                    with ThreadPoolExecutor(max_workers=len(sources_by_type)) as executor:
+                        futures = [
+                            executor.submit(apply_type, content_type, sources)
+                            for content_type, sources in sources_by_type.items()
+                        ]
+                        changes = []
+                        for future in futures:
+                            changes.extend(future.result())
+                    result["changes"] = [change for _, change in sorted(changes, key=lambda c: c[0])]
                 
                 result["success"] = True
                 result["manifest"] = manifest
@@ -88,11 +169,11 @@ class UpdateManager:
                     "manifest": manifest,
                 })
                 
-                logger.info(f"Successfully applied update: {bundle_path}")
+                logger.info("Successfully applied update: %s", bundle_path)
                 
         except Exception as e:
             result["error"] = str(e)
-            logger.error(f"Failed to apply update: {e}")
+            logger.error("Failed to apply update: %s", e)
             
             if result["backup_path"]:
                 self._restore_backup(result["backup_path"])
@@ -101,25 +182,36 @@ class UpdateManager:
         return result
     
     def _create_backup(self) -> Dict[str, Any]:
-        timestamp = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
+        timestamp = datetime.utcnow().strftime("%Y%m%d_%H%M%S_%f")
         backup_dir = self.backup_path / f"backup_{timestamp}"
-        backup_dir.mkdir(parents=True, exist_ok=True)
+        self.backup_path.mkdir(parents=True, exist_ok=True)
+        backup_dir.mkdir()
         
         backed_up = []
         
         if self.rules_path.exists():
             rules_backup = backup_dir / "sigma_rules"
-            shutil.copytree(self.rules_path, rules_backup)
+            _linktree(self.rules_path, rules_backup)
             backed_up.append("sigma_rules")
         
+        # Models are rewritten in place by the anomaly detectors, so they are copied
         if self.models_path.exists():
             models_backup = backup_dir / "models"
-            shutil.copytree(self.models_path, models_backup)
+            _copytree(self.models_path, models_backup)
             backed_up.append("models")
         
-        logger.info(f"Created backup at {backup_dir}")
+        for name, path in (("mitre", self.mitre_path), ("intel", self.intel_path)):
+            if path.exists():
+                _copytree(path, backup_dir / name)
+                backed_up.append(name)
+        
+        logger.info("Created backup at %s", backup_dir)
         return {"path": str(backup_dir), "contents": backed_up}
     
+    def _discard_backup(self, backup_path: Optional[str]):
+        if backup_path:
+            shutil.rmtree(backup_path, ignore_errors=True)
+    
     def _restore_backup(self, backup_path: str):
         backup_path = Path(backup_path)
         
@@ -127,15 +219,22 @@ class UpdateManager:
         if rules_backup.exists():
             if self.rules_path.exists():
                 shutil.rmtree(self.rules_path)
-            shutil.copytree(rules_backup, self.rules_path)
+            _copytree(rules_backup, self.rules_path)
         
         models_backup = backup_path / "models"
         if models_backup.exists():
             if self.models_path.exists():
                 shutil.rmtree(self.models_path)
-            shutil.copytree(models_backup, self.models_path)
+            _copytree(models_backup, self.models_path)
         
-        logger.info(f"Restored from backup: {backup_path}")
+        for name, path in (("mitre", self.mitre_path), ("intel", self.intel_path)):
+            data_backup = backup_path / name
+            if data_backup.exists():
+                if path.exists():
+                    shutil.rmtree(path)
+                _copytree(data_backup, path)
+        
+        logger.info("Restored from backup: %s", backup_path)
     
     def _apply_sigma_rules(self, source: Path) -> Dict[str, Any]:
         if not source.exists():
@@ -143,26 +242,36 @@ class UpdateManager:
         
         self.rules_path.mkdir(parents=True, exist_ok=True)
         
+        rule_files = list(source.rglob("*.yml"))
+        parents = {(self.rules_path / f.relative_to(source)).parent for f in rule_files}
+        for parent in parents:
+            parent.mkdir(parents=True, exist_ok=True)
+        
         new_count = 0
         updated_count = 0
+        skipped_count = 0
         
-        for rule_file in source.rglob("*.yml"):
+        for rule_file in rule_files:
             relative = rule_file.relative_to(source)
             target = self.rules_path / relative
-            target.parent.mkdir(parents=True, exist_ok=True)
             
             if target.exists():
+                # Most rules in an update are unchanged; compares size before content
+                if filecmp.cmp(rule_file, target, shallow=False):
+                    skipped_count += 1
+                    continue
                 updated_count += 1
             else:
                 new_count += 1
             
-            shutil.copy2(rule_file, target)
+            _replace_file(rule_file, target)
         
         return {
             "type": "sigma_rules",
             "status": "applied",
             "new": new_count,
             "updated": updated_count,
+            "skipped": skipped_count,
         }
     
     def _apply_models(self, source: Path) -> Dict[str, Any]:
@@ -171,33 +280,34 @@ class UpdateManager:
         
         self.models_path.mkdir(parents=True, exist_ok=True)
         
-        count = 0
-        for model_file in source.rglob("*"):
-            if model_file.suffix in [".pkl", ".onnx", ".joblib"]:
-                relative = model_file.relative_to(source)
-                target = self.models_path / relative
-                target.parent.mkdir(parents=True, exist_ok=True)
-                shutil.copy2(model_file, target)
-                count += 1
+        model_files = [
+            f for f in source.rglob("*")
+            if f.suffix in [".pkl", ".onnx", ".joblib"]
+        ]
+        parents = {(self.models_path / f.relative_to(source)).parent for f in model_files}
+        for parent in parents:
+            parent.mkdir(parents=True, exist_ok=True)
+        
+        for model_file in model_files:
+            relative = model_file.relative_to(source)
+            _replace_file(model_file, self.models_path / relative)
         
-        return {"type": "models", "status": "applied", "count": count}
+        return {"type": "models", "status": "applied", "count": len(model_files)}
     
     def _apply_mitre_data(self, source: Path) -> Dict[str, Any]:
-        mitre_path = self.rules_path.parent / "mitre"
-        mitre_path.mkdir(parents=True, exist_ok=True)
+        self.mitre_path.mkdir(parents=True, exist_ok=True)
         
         for json_file in source.rglob("*.json"):
-            shutil.copy2(json_file, mitre_path / json_file.name)
+            shutil.copy2(json_file, self.mitre_path / json_file.name)
         
         return {"type": "mitre", "status": "applied"}
     
     def _apply_intel_data(self, source: Path) -> Dict[str, Any]:
-        intel_path = self.rules_path.parent / "intel"
-        intel_path.mkdir(parents=True, exist_ok=True)
+        self.intel_path.mkdir(parents=True, exist_ok=True)
         
         for file in source.rglob("*"):
             if file.is_file():
-                shutil.copy2(file, intel_path / file.name)
+                shutil.copy2(file, self.intel_path / file.name)
         
         return {"type": "intel", "status": "applied"}
     
@@ -210,17 +320,30 @@ class UpdateManager:
         if not updates_dir.exists():
             return []
         
+        for key in list(_manifest_cache):
+            try:
+                st = Path(key[0]).stat()
+            except OSError:
+                del _manifest_cache[key]
+                continue
+            if (st.st_mtime_ns, st.st_size) != key[1:]:
+                del _manifest_cache[key]
+        
         updates = []
         for bundle_file in updates_dir.glob("*.tar.gz"):
             try:
-                bundle = UpdateBundle(str(bundle_file))
-                manifest = bundle.get_manifest()
+                st = bundle_file.stat()
+                key = (str(bundle_file), st.st_mtime_ns, st.st_size)
+                manifest = _manifest_cache.get(key)
+                if manifest is None:
+                    manifest = UpdateBundle(str(bundle_file)).get_manifest()
+                    _manifest_cache[key] = manifest
                 updates.append({
                     "path": str(bundle_file),
                     "manifest": manifest,
-                    "size": bundle_file.stat().st_size,
+                    "size": st.st_size,
                 })
             except Exception as e:
-                logger.warning(f"Could not read bundle {bundle_file}: {e}")
+                logger.warning("Could not read bundle %s: %s", bundle_file, e)
         
         return updates
@@ -2,12 +2,23 @@
 import hashlib
 import json
 import logging
+import mmap
+import os
 import tarfile
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Iterator, Optional
 
 logger = logging.getLogger(__name__)
 
+try:
+    from cryptography.exceptions import InvalidSignature
+    from cryptography.hazmat.primitives import serialization
+    from cryptography.hazmat.primitives.asymmetric import ed25519
+    CRYPTOGRAPHY_AVAILABLE = True
+except ImportError:
+    CRYPTOGRAPHY_AVAILABLE = False
+
 class UpdateVerifier:
     
     def __init__(self, public_key_path: Optional[str] = None):
@@ -18,16 +29,16 @@ class UpdateVerifier:
             self._load_public_key()
     
     def _load_public_key(self):
+        if not CRYPTOGRAPHY_AVAILABLE:
+            logger.warning("cryptography package not available, signature verification disabled")
+            return
+        
         try:
-            from cryptography.hazmat.primitives import serialization
-            
             with open(self.public_key_path, "rb") as f:
                 self._public_key = serialization.load_pem_public_key(f.read())
             logger.info("Loaded public key for update verification")
-        except ImportError:
-            logger.warning("cryptography package not available, signature verification disabled")
         except Exception as e:
-            logger.warning(f"Failed to load public key: {e}")
+            logger.warning("Failed to load public key: %s", e)
     
     def verify_bundle(self, bundle_path: str) -> Dict[str, Any]:
         bundle_path = Path(bundle_path)
@@ -44,29 +55,30 @@ class UpdateVerifier:
         }
         
         try:
-            bundle_hash = self._calculate_file_hash(bundle_path)
-            result["bundle_hash"] = bundle_hash
-            
-            manifest = self._extract_manifest(bundle_path)
-            result["manifest"] = manifest
-            
-            if not manifest:
-                result["valid"] = False
-                result["errors"].append("Could not read manifest")
-                return result
-            
-            checksum_result = self._verify_internal_checksums(bundle_path, manifest)
-            result["checksum_valid"] = checksum_result["valid"]
-            if not checksum_result["valid"]:
-                result["valid"] = False
-                result["errors"].extend(checksum_result.get("errors", []))
-            
-            if self._public_key:
-                sig_result = self._verify_signature(bundle_path)
-                result["signature_valid"] = sig_result["valid"]
-                if not sig_result["valid"]:
+            with self._map_file(bundle_path) as bundle_data:
+                bundle_digest = hashlib.sha256(bundle_data).digest()
+                result["bundle_hash"] = bundle_digest.hex()
+                
+                manifest = self._extract_manifest(bundle_path)
+                result["manifest"] = manifest
+                
+                if not manifest:
+                    result["valid"] = False
+                    result["errors"].append("Could not read manifest")
+                    return result
+                
+                checksum_result = self._verify_internal_checksums(bundle_path, manifest)
+                result["checksum_valid"] = checksum_result["valid"]
+                if not checksum_result["valid"]:
                     result["valid"] = False
-                    result["errors"].append("Invalid signature")
+                    result["errors"].extend(checksum_result.get("errors", []))
+                
+                if self._public_key:
+                    sig_result = self._verify_signature(bundle_path, bundle_data, bundle_digest)
+                    result["signature_valid"] = sig_result["valid"]
+                    if not sig_result["valid"]:
+                        result["valid"] = False
+                        result["errors"].append("Invalid signature")
             
         except Exception as e:
             result["valid"] = False
@@ -74,11 +86,34 @@ class UpdateVerifier:
         
         return result
     
+    @staticmethod
+    @contextmanager
+    def _map_file(file_path: Path) -> Iterator[memoryview]:
+        with open(file_path, "rb") as f:
+            try:
+                mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                # Empty files cannot be mapped
+                yield memoryview(b"")
+                return
+        
+        try:
+            if hasattr(mmap, "MADV_SEQUENTIAL"):
+                mm.madvise(mmap.MADV_SEQUENTIAL)
+            view = memoryview(mm)
+            try:
+                yield view
+            finally:
+                view.release()
+        finally:
+            mm.close()
+    
     def _calculate_file_hash(self, file_path: Path) -> str:
         sha256 = hashlib.sha256()
+        buf = memoryview(bytearray(1 << 20))
         with open(file_path, "rb") as f:
-            for chunk in iter(lambda: f.read(8192), b""):
-                sha256.update(chunk)
+            while n := f.readinto(buf):
+                sha256.update(buf[:n])
         return sha256.hexdigest()
     
     def _extract_manifest(self, bundle_path: Path) -> Optional[Dict[str, Any]]:
@@ -90,7 +125,7 @@ class UpdateVerifier:
                         if f:
                             return json.load(f)
         except Exception as e:
-            logger.error(f"Failed to extract manifest: {e}")
+            logger.error("Failed to extract manifest: %s", e)
         return None
     
     def _verify_internal_checksums(
@@ -122,15 +157,22 @@ class UpdateVerifier:
         except Exception as e:
             return {"valid": False, "errors": [str(e)]}
     
-    def _verify_signature(self, bundle_path: Path) -> Dict[str, Any]:
+    def _verify_signature(
+        self,
+        bundle_path: Path,
+        bundle_data: Optional[memoryview] = None,
+        bundle_digest: Optional[bytes] = None,
+    ) -> Dict[str, Any]:
         if not self._public_key:
             return {"valid": False, "error": "No public key loaded"}
         
+        if not CRYPTOGRAPHY_AVAILABLE:
+            return {"valid": False, "error": "cryptography package not available"}
+        
         try:
-            from cryptography.hazmat.primitives.asymmetric import ed25519
-            from cryptography.exceptions import InvalidSignature
-            
-            sig_path = bundle_path.with_suffix(".sig")
+            sig_path = bundle_path.with_name(bundle_path.name + ".sig")
+            if not sig_path.exists():
+                sig_path = bundle_path.with_suffix(".sig")
             if not sig_path.exists():
                 with tarfile.open(bundle_path, "r:gz") as tar:
                     for member in tar.getmembers():
@@ -145,8 +187,19 @@ class UpdateVerifier:
                 with open(sig_path, "rb") as f:
                     signature = f.read()
             
-            with open(bundle_path, "rb") as f:
-                bundle_data = f.read()
+            if bundle_digest is None:
+                bundle_digest = bytes.fromhex(self._calculate_file_hash(bundle_path))
+            
+            # Packages are signed over their SHA-256 digest; older ones signed the raw bytes
+            try:
+                self._public_key.verify(signature, bundle_digest)
+                return {"valid": True}
+            except InvalidSignature:
+                pass
+            
+            if bundle_data is None:
+                with open(bundle_path, "rb") as f:
+                    bundle_data = f.read()
             
             try:
                 self._public_key.verify(signature, bundle_data)
@@ -154,43 +207,45 @@ class UpdateVerifier:
             except InvalidSignature:
                 return {"valid": False, "error": "Invalid signature"}
                 
-        except ImportError:
-            return {"valid": False, "error": "cryptography package not available"}
         except Exception as e:
             return {"valid": False, "error": str(e)}
     
     @staticmethod
     def generate_keypair(output_dir: str) -> Dict[str, str]:
-        try:
-            from cryptography.hazmat.primitives.asymmetric import ed25519
-            from cryptography.hazmat.primitives import serialization
-            
-            output_dir = Path(output_dir)
-            output_dir.mkdir(parents=True, exist_ok=True)
-            
-            private_key = ed25519.Ed25519PrivateKey.generate()
-            public_key = private_key.public_key()
-            
-            private_path = output_dir / "update_signing_key.pem"
-            with open(private_path, "wb") as f:
-                f.write(private_key.private_bytes(
-                    encoding=serialization.Encoding.PEM,
-                    format=serialization.PrivateFormat.PKCS8,
-                    encryption_algorithm=serialization.NoEncryption(),
-                ))
-            
-            public_path = output_dir / "update_verify_key.pem"
-            with open(public_path, "wb") as f:
-                f.write(public_key.public_bytes(
-                    encoding=serialization.Encoding.PEM,
-                    format=serialization.PublicFormat.SubjectPublicKeyInfo,
-                ))
-            
-            logger.info(f"Generated keypair in {output_dir}")
-            return {
-                "private_key": str(private_path),
-                "public_key": str(public_path),
-            }
-            
-        except ImportError:
+        if not CRYPTOGRAPHY_AVAILABLE:
             raise RuntimeError("cryptography package required for key generation")
+        
+        output_dir = Path(output_dir)
+        output_dir.mkdir(parents=True, exist_ok=True)
+        
+        private_key = ed25519.Ed25519PrivateKey.generate()
+        public_key = private_key.public_key()
+        
+        private_path = output_dir / "update_signing_key.pem"
+        private_pem = private_key.private_bytes(
+            encoding=serialization.Encoding.PEM,
+            format=serialization.PrivateFormat.PKCS8,
+            encryption_algorithm=serialization.NoEncryption(),
+        )
+        # The signing key must not be readable by other users
+        flags = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0)
+        fd = os.open(private_path, flags, 0o600)
+        try:
+            if hasattr(os, "fchmod"):
+                os.fchmod(fd, 0o600)
+            os.write(fd, private_pem)
+        finally:
+            os.close(fd)
+        
+        public_path = output_dir / "update_verify_key.pem"
+        with open(public_path, "wb") as f:
+            f.write(public_key.public_bytes(
+                encoding=serialization.Encoding.PEM,
+                format=serialization.PublicFormat.SubjectPublicKeyInfo,
+            ))
+        
+        logger.info("Generated keypair in %s", output_dir)
+        return {
+            "private_key": str(private_path),
+            "public_key": str(public_path),
+        }
@@ -1,6 +1,7 @@
 
 from .helpers import (
     generate_uuid,
+    get_current_epoch_ns,
     get_current_timestamp,
     hash_string,
     safe_json_loads,
@@ -9,6 +10,7 @@ from .helpers import (
 
 __all__ = [
     "generate_uuid",
+    "get_current_epoch_ns",
     "get_current_timestamp",
     "hash_string",
     "safe_json_loads",
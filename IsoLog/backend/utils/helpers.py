@@ -1,29 +1,135 @@
 
 import hashlib
 import json
-import uuid
-from datetime import datetime, timezone
-from typing import Any, Dict, Optional
+import os
+import re
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from typing import Any, Dict, Optional, Tuple, Union
+
+_UTC = timezone.utc
+
+_UUID_POOL_SIZE = 4096
+_uuid_lock = threading.Lock()
+_uuid_pool = bytearray()
+_uuid_offset = 0
+
+_CTORS = {
+    "sha256": hashlib.sha256,
+    "sha512": hashlib.sha512,
+    "md5": hashlib.md5,
+}
+
+_MONTHS = {
+    "jan": 1, "feb": 2, "mar": 3, "apr": 4, "may": 5, "jun": 6,
+    "jul": 7, "aug": 8, "sep": 9, "oct": 10, "nov": 11, "dec": 12,
+}
+
+_TS_RE = re.compile(
+    r"(?P<year>\d{4})-(?P<month>\d{1,2})-(?P<day>\d{1,2})[Tt ]"
+    r"(?P<hour>\d{1,2}):(?P<minute>\d{1,2}):(?P<second>\d{1,2})"
+    r"(?:\.(?P<fraction>\d{1,6}))?"
+    r"(?:(?P<zulu>[Zz])|(?P<tz_sign>[+-])(?P<tz_hour>\d{2})(?P<tz_colon>:?)(?P<tz_minute>[0-5]\d)"
+    r"(?:(?P=tz_colon)(?P<tz_second>[0-5]\d)(?:\.(?P<tz_fraction>\d{1,6}))?)?)?"
+    r"|(?P<syslog_month>[A-Za-z]{3})\s+(?P<syslog_day>\d{1,2})\s+"
+    r"(?P<syslog_hour>\d{1,2}):(?P<syslog_minute>\d{1,2}):(?P<syslog_second>\d{1,2})"
+)
+
+_year_cache = (0.0, 0)
+_YEAR_REFRESH_SECONDS = 60
+
+_DEFAULT_SUFFIX = "..."
+_DEFAULT_SUFFIX_LEN = len(_DEFAULT_SUFFIX)
+
+_BYTE_UNITS = ("B", "KB", "MB", "GB", "TB", "PB")
+
+_SANITIZE_TABLE = str.maketrans({c: "_" for c in '<>:"/\\|?*'})
+
+_LONG_DIGITS_RE = re.compile(r"\d{19,}")
+
+try:
+    import orjson
+    
+    def _json_loads(data: Any) -> Any:
+        # orjson turns integers outside 64 bits into floats and rejects NaN/Infinity,
+        # so anything it might get wrong is left to json
+        if type(data) is str and _LONG_DIGITS_RE.search(data) is None:
+            try:
+                return orjson.loads(data)
+            except orjson.JSONDecodeError:
+                pass
+        return json.loads(data)
+except ImportError:
+    _json_loads = json.loads
+
+try:
+    from stringzilla import sha256 as _sz_sha256
+    
+    def _sha256_hex(data: bytes) -> str:
+        return _sz_sha256(data).hex()
+except ImportError:
+    def _sha256_hex(data: bytes) -> str:
+        return hashlib.sha256(data).hexdigest()
 
 def generate_uuid() -> str:
-    return str(uuid.uuid4())
+    with _uuid_lock:
+        global _uuid_pool, _uuid_offset
+        if _uuid_offset >= len(_uuid_pool):
+            _uuid_pool = bytearray(os.urandom(_UUID_POOL_SIZE))
+            _uuid_offset = 0
+        raw = _uuid_pool[_uuid_offset:_uuid_offset + 16]
+        _uuid_offset += 16
+    
+    raw[6] = (raw[6] & 0x0F) | 0x40
+    raw[8] = (raw[8] & 0x3F) | 0x80
+    h = raw.hex()
+    return f"{h[:8]}-{h[8:12]}-{h[12:16]}-{h[16:20]}-{h[20:]}"
+
+def _reset_uuid_pool() -> None:
+    global _uuid_lock, _uuid_pool, _uuid_offset
+    _uuid_lock = threading.Lock()
+    _uuid_pool = bytearray()
+    _uuid_offset = 0
+
+# A forked child must not hand out the parent's remaining pooled bytes
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_uuid_pool)
 
 def get_current_timestamp() -> datetime:
-    return datetime.now(timezone.utc)
+    return datetime.fromtimestamp(time.time(), _UTC)
+
+def get_current_epoch_ns() -> int:
+    return time.time_ns()
 
 def hash_string(data: str, algorithm: str = "sha256") -> str:
-    hasher = hashlib.new(algorithm)
-    hasher.update(data.encode("utf-8"))
-    return hasher.hexdigest()
+    if algorithm == "sha256":
+        return _sha256_hex(data.encode("utf-8"))
+    ctor = _CTORS.get(algorithm)
+    if ctor is None:
+        return hashlib.new(algorithm, data.encode("utf-8")).hexdigest()
+    return ctor(data.encode("utf-8")).hexdigest()
 
 def hash_bytes(data: bytes, algorithm: str = "sha256") -> str:
-    hasher = hashlib.new(algorithm)
-    hasher.update(data)
+    if algorithm == "sha256":
+        return _sha256_hex(data)
+    ctor = _CTORS.get(algorithm)
+    if ctor is None:
+        return hashlib.new(algorithm, data).hexdigest()
+    return ctor(data).hexdigest()
+
+def hash_file(path: str, algorithm: str = "sha256", chunk_size: int = 262144) -> str:
+    ctor = _CTORS.get(algorithm)
+    hasher = ctor() if ctor is not None else hashlib.new(algorithm)
+    with open(path, "rb") as f:
+        while chunk := f.read(chunk_size):
+            hasher.update(chunk)
     return hasher.hexdigest()
 
 def safe_json_loads(data: str, default: Any = None) -> Any:
     try:
-        return json.loads(data)
+        return _json_loads(data)
     except (json.JSONDecodeError, TypeError):
         return default
 
@@ -33,54 +139,98 @@ def safe_json_dumps(data: Any, default: str = "{}") -> str:
     except (TypeError, ValueError):
         return default
 
-def truncate_string(text: str, max_length: int = 100, suffix: str = "...") -> str:
+def truncate_string(text: str, max_length: int = 100, suffix: str = _DEFAULT_SUFFIX) -> str:
     if len(text) <= max_length:
         return text
-    return text[: max_length - len(suffix)] + suffix
+    suffix_len = _DEFAULT_SUFFIX_LEN if suffix is _DEFAULT_SUFFIX else len(suffix)
+    return text[: max_length - suffix_len] + suffix
 
 def parse_timestamp(timestamp_str: str) -> Optional[datetime]:
-    formats = [
-        "%Y-%m-%dT%H:%M:%S.%fZ",
-        "%Y-%m-%dT%H:%M:%SZ",
-        "%Y-%m-%dT%H:%M:%S.%f%z",
-        "%Y-%m-%dT%H:%M:%S%z",
-        "%Y-%m-%d %H:%M:%S.%f",
-        "%Y-%m-%d %H:%M:%S",
-        "%b %d %H:%M:%S",
-        "%b  %d %H:%M:%S",
-    ]
-    
-    for fmt in formats:
+    parsed = _parse_timestamp_cached(timestamp_str)
+    if type(parsed) is tuple:
+        # Syslog timestamps carry no year, so only their fields are cached
         try:
-            dt = datetime.strptime(timestamp_str, fmt)
-            if dt.year == 1900:
-                dt = dt.replace(year=datetime.now().year)
-            return dt
+            return datetime(_current_year(), *parsed)
         except ValueError:
-            continue
+            return None
+    return parsed
+
+def _current_year() -> int:
+    global _year_cache
+    now = time.time()
+    if now - _year_cache[0] >= _YEAR_REFRESH_SECONDS:
+        _year_cache = (now, datetime.now().year)
+    return _year_cache[1]
+
+@lru_cache(maxsize=4096)
+def _parse_timestamp_cached(
+    timestamp_str: str,
+) -> Union[datetime, Tuple[int, int, int, int, int], None]:
+    match = _TS_RE.fullmatch(timestamp_str)
+    if match is None:
+        return None
     
-    return None
+    groups = match.groupdict()
+    try:
+        if groups["year"] is None:
+            month = _MONTHS.get(groups["syslog_month"].lower())
+            if month is None:
+                return None
+            return (
+                month,
+                int(groups["syslog_day"]),
+                int(groups["syslog_hour"]),
+                int(groups["syslog_minute"]),
+                int(groups["syslog_second"]),
+            )
+        
+        fraction = groups["fraction"]
+        tzinfo = None
+        if groups["tz_sign"] is not None:
+            tz_fraction = groups["tz_fraction"]
+            offset = timedelta(
+                hours=int(groups["tz_hour"]),
+                minutes=int(groups["tz_minute"]),
+                seconds=int(groups["tz_second"] or 0),
+                microseconds=int(tz_fraction.ljust(6, "0")) if tz_fraction else 0,
+            )
+            tzinfo = timezone(-offset if groups["tz_sign"] == "-" else offset)
+        
+        return datetime(
+            int(groups["year"]),
+            int(groups["month"]),
+            int(groups["day"]),
+            int(groups["hour"]),
+            int(groups["minute"]),
+            int(groups["second"]),
+            int(fraction.ljust(6, "0")) if fraction else 0,
+            tzinfo,
+        )
+    except ValueError:
+        return None
 
 def merge_dicts(base: Dict[str, Any], override: Dict[str, Any]) -> Dict[str, Any]:
-    result = base.copy()
-    
-    for key, value in override.items():
-        if key in result and isinstance(result[key], dict) and isinstance(value, dict):
-            result[key] = merge_dicts(result[key], value)
-        else:
-            result[key] = value
+    if not override:
+        return base.copy()
+    if not base:
+        return override.copy()
     
+    result = {**base}
+    _merge_into(result, override)
     return result
 
+def _merge_into(dst: Dict[str, Any], src: Dict[str, Any]) -> None:
+    for key, value in src.items():
+        current = dst.get(key)
+        if current is not None and type(current) is dict and type(value) is dict:
+            current = dst[key] = {**current}
+            _merge_into(current, value)
+        else:
+            dst[key] = value
+
 def format_bytes(size: int) -> str:
-    for unit in ["B", "KB", "MB", "GB", "TB"]:
-        if abs(size) < 1024.0:
-            return f"{size:.1f} {unit}"
-        size /= 1024.0
-    return f"{size:.1f} PB"
+    idx = min((max(abs(int(size)), 1).bit_length() - 1) // 10, len(_BYTE_UNITS) - 1)
+    return f"{size / (1 << (idx * 10)):.1f} {_BYTE_UNITS[idx]}"
 
 def sanitize_filename(filename: str) -> str:
-    unsafe_chars = '<>:"/\\|?*'
-    for char in unsafe_chars:
-        filename = filename.replace(char, "_")
-    return filename.strip()
+    return filename.translate(_SANITIZE_TABLE).strip()
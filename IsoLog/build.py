@@ -3,49 +3,117 @@
 import argparse
 import os
 import shutil
+import signal
 import subprocess
 import sys
+import threading
+import zipfile
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 
-def run_command(cmd: list, cwd: Path = None):
-    print(f"Running: {' '.join(cmd)}")
-    result = subprocess.run(cmd, cwd=cwd, capture_output=True, text=True)
-    if result.returncode != 0:
-        print(f"Error: {result.stderr}")
+# Already-compressed assets gain nothing from deflate
+STORED_EXTENSIONS = {
+    ".png", ".jpg", ".jpeg", ".gif", ".webp",
+    ".woff", ".woff2", ".gz", ".br", ".zip", ".whl",
+}
+
+_children = set()
+_children_lock = threading.Lock()
+_aborted = threading.Event()
+
+def terminate_children():
+    _aborted.set()
+    with _children_lock:
+        for proc in _children:
+            if proc.poll() is not None:
+                continue
+            # npm and PyInstaller spawn their own children; signal the whole group
+            if os.name == "posix":
+                try:
+                    os.killpg(proc.pid, signal.SIGTERM)
+                except ProcessLookupError:
+                    pass
+            else:
+                proc.terminate()
+
+def run_command(cmd: list, cwd: Path = None, label: str = None):
+    prefix = f"[{label}] " if label else ""
+    print(f"{prefix}Running: {' '.join(cmd)}")
+    
+    if label is None:
+        # The child writes straight to our stdout/stderr; nothing is buffered here
+        result = subprocess.run(cmd, cwd=cwd)
+        if result.returncode != 0:
+            print(f"Error: command exited with status {result.returncode}")
+            sys.exit(1)
+        return result
+    
+    # Labelled output is relayed line by line so concurrent builds stay readable;
+    # only the last few lines are kept, to repeat them if the command fails
+    tail = deque(maxlen=20)
+    with _children_lock:
+        if _aborted.is_set():
+            sys.exit(1)
+        proc = subprocess.Popen(
+            cmd,
+            cwd=cwd,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            text=True,
+            bufsize=1,
+            start_new_session=os.name == "posix",
+        )
+        _children.add(proc)
+    
+    with proc:
+        for line in proc.stdout:
+            tail.append(line)
+            print(f"{prefix}{line}", end="", flush=True)
+    
+    with _children_lock:
+        _children.discard(proc)
+    
+    if _aborted.is_set():
+        sys.exit(1)
+    
+    if proc.returncode != 0:
+        print(f"{prefix}Error: command exited with status {proc.returncode}")
+        for line in tail:
+            print(f"{prefix}  {line}", end="")
         sys.exit(1)
-    print(result.stdout)
-    return result
+    return proc
 
-def build_backend():
+def build_backend(label: str = None):
     project_root = Path(__file__).parent
     
     print("Building backend executable...")
     
-    run_command([sys.executable, "-m", "pip", "install", "pyinstaller"])
+    run_command([sys.executable, "-m", "pip", "install", "pyinstaller"], label=label)
     
     run_command([
         sys.executable, "-m", "PyInstaller",
         "--clean",
         str(project_root / "isolog.spec"),
-    ], cwd=project_root)
+    ], cwd=project_root, label=label)
     
     print("Backend built successfully!")
     print(f"Output: {project_root / 'dist' / 'isolog'}")
 
-def build_frontend():
+def build_frontend(label: str = None):
     project_root = Path(__file__).parent
     ui_path = project_root / "ui"
     
     print("Building frontend...")
     
-    run_command(["npm", "install"], cwd=ui_path)
+    run_command(["npm", "install"], cwd=ui_path, label=label)
     
-    run_command(["npm", "run", "build"], cwd=ui_path)
+    run_command(["npm", "run", "build"], cwd=ui_path, label=label)
     
     print("Frontend built successfully!")
     print(f"Output: {ui_path / 'dist'}")
 
-def build_docker():
+def build_docker(label: str = None):
     project_root = Path(__file__).parent
     docker_path = project_root / "docker"
     
@@ -55,7 +123,7 @@ def build_docker():
         "docker-compose",
         "-f", str(docker_path / "docker-compose.yml"),
         "build",
-    ], cwd=project_root)
+    ], cwd=project_root, label=label)
     
     print("Docker images built successfully!")
 
@@ -129,13 +197,51 @@ Documentation: https://github.com/your-org/isolog
     print(f"Portable package created: {package_path}")
     
     archive_path = dist_path / "isolog-portable.zip"
-    shutil.make_archive(
-        str(dist_path / "isolog-portable"),
-        "zip",
-        package_path,
-    )
+    create_zip_archive(package_path, archive_path)
     print(f"Archive created: {archive_path}")
 
+def create_zip_archive(source_dir: Path, archive_path: Path):
+    with zipfile.ZipFile(
+        archive_path, "w", zipfile.ZIP_DEFLATED, compresslevel=1, allowZip64=True
+    ) as zf:
+        for dirpath, dirnames, filenames in os.walk(source_dir):
+            dirnames.sort()
+            current = Path(dirpath)
+            if current != source_dir:
+                zf.write(current, current.relative_to(source_dir).as_posix() + "/")
+            for name in sorted(filenames):
+                file_path = current / name
+                arcname = file_path.relative_to(source_dir).as_posix()
+                if file_path.suffix.lower() in STORED_EXTENSIONS:
+                    zf.write(file_path, arcname, compress_type=zipfile.ZIP_STORED)
+                else:
+                    zf.write(file_path, arcname)
+
+def build_all():
+    # Backend and frontend write to separate trees, so they run side by side.
+    # Docker runs afterwards: its build context is the project root. It runs
+    # unlabelled, in our process group, so Ctrl-C reaches docker-compose directly.
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        futures = {
+            executor.submit(build_backend, "backend"): "backend",
+            executor.submit(build_frontend, "frontend"): "frontend",
+        }
+        
+        try:
+            for future in as_completed(futures):
+                if future.exception() is not None:
+                    print(f"Build target '{futures[future]}' failed")
+                    terminate_children()
+                    break
+        except KeyboardInterrupt:
+            terminate_children()
+            raise
+    
+    if _aborted.is_set():
+        sys.exit(1)
+    
+    build_docker()
+
 def main():
     parser = argparse.ArgumentParser(description="IsoLog Build Script")
     parser.add_argument(
@@ -153,9 +259,7 @@ def main():
     elif args.target == "docker":
         build_docker()
     elif args.target == "all":
-        build_backend()
-        build_frontend()
-        build_docker()
+        build_all()
     elif args.target == "portable":
         build_backend()
         build_frontend()
@@ -7,6 +7,7 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from backend.updates.bundle import UpdateBundle
+from backend.utils.helpers import hash_file
 
 def main():
     parser = argparse.ArgumentParser(description="Build IsoLog update package")
@@ -92,10 +93,8 @@ def sign_package(package_path: str, private_key_path: str):
         with open(private_key_path, "rb") as f:
             private_key = serialization.load_pem_private_key(f.read(), password=None)
         
-        with open(package_path, "rb") as f:
-            package_data = f.read()
-        
-        signature = private_key.sign(package_data)
+        # Sign the SHA-256 digest so the package is streamed instead of read into memory
+        signature = private_key.sign(bytes.fromhex(hash_file(package_path)))
         
         sig_path = package_path + ".sig"
         with open(sig_path, "wb") as f:
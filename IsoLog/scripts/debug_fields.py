@@ -3,6 +3,14 @@ import zipfile
 from pathlib import Path
 import yaml
 
+try:
+    import orjson
+    json_loads = orjson.loads
+except ImportError:
+    json_loads = json.loads
+
+YamlLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
 failing_datasets = [
     "SDWIN-190518230752",  # Empire Mimikatz Extract Kerberos Keys (T1003.004)
     "SDWIN-190518235535",  # Empire Mimikatz Backup Keys (T1003)
@@ -15,8 +23,8 @@ data_path = Path(r'd:\Project_IsoLog\Security-Datasets\datasets')
 for ds_id in failing_datasets:
     yaml_file = meta_path / f"{ds_id}.yaml"
     if yaml_file.exists():
-        with open(yaml_file) as f:
-            meta = yaml.safe_load(f)
+        with open(yaml_file, 'rb') as f:
+            meta = yaml.load(f, Loader=YamlLoader)
         
         print("=" * 70)
         print(f"Dataset: {ds_id}")
@@ -33,26 +41,22 @@ for ds_id in failing_datasets:
                         with zipfile.ZipFile(zip_path, 'r') as zf:
                             for name in zf.namelist():
                                 if name.endswith('.json'):
-                                    with zf.open(name) as jf:
-                                        lines = jf.read().decode('utf-8').strip().split('\n')
-                                        
-                                        print(f"Total events: {len(lines)}")
-                                        
-                                        cmd_events = []
-                                        for i, line in enumerate(lines):
-                                            raw = json.loads(line)
-                                            cmd = raw.get('CommandLine', '')
-                                            if cmd and len(cmd) > 10:
-                                                cmd_events.append({
-                                                    'i': i,
-                                                    'EventID': raw.get('EventID'),
-                                                    'cmd': cmd[:150]
-                                                })
-                                        
-                                        print(f"Events with CommandLine: {len(cmd_events)}")
-                                        print("Sample commands:")
-                                        for ev in cmd_events[:8]:
-                                            print(f"  [{ev['EventID']}] {ev['cmd']}")
+                                    # Parse straight from the member's bytes; orjson accepts bytes
+                                    lines = [line for line in zf.read(name).split(b'\n') if line.strip()]
+                                    raws = [json_loads(line) for line in lines]
+                                    
+                                    print(f"Total events: {len(lines)}")
+                                    
+                                    cmd_events = [
+                                        {'i': i, 'EventID': raw.get('EventID'), 'cmd': cmd[:150]}
+                                        for i, raw in enumerate(raws)
+                                        if len(cmd := raw.get('CommandLine') or '') > 10
+                                    ]
+                                    
+                                    print(f"Events with CommandLine: {len(cmd_events)}")
+                                    print("Sample commands:")
+                                    for ev in cmd_events[:8]:
+                                        print(f"  [{ev['EventID']}] {ev['cmd']}")
                                     break
                 break
         print()
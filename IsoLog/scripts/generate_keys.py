@@ -1,9 +1,21 @@
 #!/usr/bin/env python3
 
 import argparse
+import os
 import sys
 from pathlib import Path
 
+def write_private_file(path: Path, data: bytes):
+    # Create the file owner-only from the start instead of chmod-ing after the write
+    flags = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0)
+    fd = os.open(path, flags, 0o600)
+    try:
+        if hasattr(os, "fchmod"):
+            os.fchmod(fd, 0o600)
+        os.write(fd, data)
+    finally:
+        os.close(fd)
+
 def generate_keypair(output_dir: str):
     try:
         from cryptography.hazmat.primitives.asymmetric import ed25519
@@ -19,12 +31,12 @@ def generate_keypair(output_dir: str):
     public_key = private_key.public_key()
     
     private_path = output_path / "update_signing_key.pem"
-    with open(private_path, "wb") as f:
-        f.write(private_key.private_bytes(
-            encoding=serialization.Encoding.PEM,
-            format=serialization.PrivateFormat.PKCS8,
-            encryption_algorithm=serialization.NoEncryption(),
-        ))
+    private_pem = private_key.private_bytes(
+        encoding=serialization.Encoding.PEM,
+        format=serialization.PrivateFormat.PKCS8,
+        encryption_algorithm=serialization.NoEncryption(),
+    )
+    write_private_file(private_path, private_pem)
     print(f"Private key saved: {private_path}")
     print("⚠️  Keep this file secure! Do not commit to version control.")
     
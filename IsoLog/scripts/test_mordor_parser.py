@@ -3,6 +3,7 @@ sys.path.insert(0, '.')
 from backend.parsers.formats.mordor import MordorParser
 import json
 import zipfile
+from itertools import islice
 from pathlib import Path
 
 p = MordorParser()
@@ -16,7 +17,7 @@ with zipfile.ZipFile(zip_path, 'r') as zf:
         if name.endswith('.json'):
             print(f"Found: {name}")
             with zf.open(name) as f:
-                lines = f.read().decode('utf-8').strip().split('\n')[:5]
+                lines = islice(f, 5)
                 for i, line in enumerate(lines):
                     event = json.loads(line)
                     parsed = p.parse_dict(event)
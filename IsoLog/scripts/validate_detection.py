@@ -2,16 +2,29 @@
 
 import argparse
 import asyncio
+import io
 import json
 import logging
+import mmap
+import os
+import pickle
 import sys
 import zipfile
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Set
+from typing import Any, Dict, List, Optional, Set, Tuple
 
 import yaml
 
+try:
+    import orjson
+    json_loads = orjson.loads
+except ImportError:
+    json_loads = json.loads
+
+YamlLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from backend.detection.engine import DetectionEngine
@@ -23,6 +36,12 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+ANALYZE_BATCH_SIZE = 256
+META_CACHE_FILE = ".isolog_meta_cache"
+CATEGORY_INDEX_FILE = ".category_index.json"
+RULE_CACHE_PATH = Path.home() / ".cache" / "isolog" / "rules.pkl"
+MMAP_MIN_SIZE = 64 * 1024
+
 @dataclass
 class ValidationResult:
     dataset_id: str
@@ -32,6 +51,8 @@ class ValidationResult:
     total_events: int
     events_with_alerts: int
     matched: bool
+    events_analyzed: int = 0
+    stopped_early: bool = False
     
     @property
     def precision(self) -> float:
@@ -59,6 +80,10 @@ class ValidationReport:
     def matched_datasets(self) -> int:
         return sum(1 for r in self.results if r.matched)
     
+    @property
+    def stopped_early_datasets(self) -> int:
+        return sum(1 for r in self.results if r.stopped_early)
+    
     @property
     def avg_precision(self) -> float:
         if not self.results:
@@ -79,6 +104,8 @@ class ValidationReport:
         print(f"Datasets Matched: {self.matched_datasets} ({self.matched_datasets/max(1,self.total_datasets)*100:.1f}%)")
         print(f"Average Precision: {self.avg_precision*100:.1f}%")
         print(f"Average Recall:    {self.avg_recall*100:.1f}%")
+        if self.stopped_early_datasets:
+            print(f"Stopped Early:    {self.stopped_early_datasets} (precision and alerts cover analyzed events only; use --full-scan to compare)")
         print("=" * 60)
         
         for result in self.results:
@@ -86,24 +113,123 @@ class ValidationReport:
             print(f"\n{status} | {result.dataset_id}: {result.dataset_title}")
             print(f"      Expected: {sorted(result.expected_techniques)}")
             print(f"      Detected: {sorted(result.detected_techniques)}")
-            print(f"      Events: {result.total_events}, With Alerts: {result.events_with_alerts}")
+            stopped = " (stopped early)" if result.stopped_early else ""
+            print(f"      Events: {result.total_events}, Analyzed: {result.events_analyzed}{stopped}, With Alerts: {result.events_with_alerts}")
 
 class DetectionValidator:
     
-    def __init__(self, datasets_path: Path, config_path: Optional[Path] = None):
+    def __init__(
+        self,
+        datasets_path: Path,
+        config_path: Optional[Path] = None,
+        rule_cache: bool = True,
+        early_exit: bool = True,
+    ):
         self.datasets_path = datasets_path
+        self.early_exit = early_exit
         self.metadata_path = datasets_path / "datasets" / "atomic" / "_metadata"
         self.parser = MordorParser()
-        self.engine = DetectionEngine()
+        self.engine = DetectionEngine(
+            rule_cache_path=str(RULE_CACHE_PATH) if rule_cache else None
+        )
         self.report = ValidationReport()
+        self._meta_cache_path = datasets_path / META_CACHE_FILE
+        # (stamp, metadata[, (expected techniques, data file)]) per yaml path
+        self._meta_cache: Dict[str, Tuple[Any, ...]] = {}
+        self._meta_cache_dirty = False
+        self._load_meta_cache()
+    
+    def _load_meta_cache(self):
+        try:
+            with open(self._meta_cache_path, "rb") as f:
+                cache = pickle.load(f)
+        except FileNotFoundError:
+            return
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable metadata cache: {e}")
+            return
+        if isinstance(cache, dict):
+            self._meta_cache = cache
+    
+    def save_meta_cache(self):
+        if not self._meta_cache_dirty:
+            return
+        try:
+            with open(self._meta_cache_path, "wb") as f:
+                pickle.dump(self._meta_cache, f, protocol=pickle.HIGHEST_PROTOCOL)
+            self._meta_cache_dirty = False
+        except OSError as e:
+            logger.warning(f"Could not write metadata cache: {e}")
     
     async def initialize(self):
         await self.engine.initialize()
         logger.info("Detection engine initialized")
     
     def load_metadata(self, yaml_path: Path) -> Dict[str, Any]:
-        with open(yaml_path, "r", encoding="utf-8") as f:
-            return yaml.safe_load(f)
+        st = yaml_path.stat()
+        stamp = (st.st_mtime_ns, st.st_size)
+        key = str(yaml_path)
+        
+        cached = self._meta_cache.get(key)
+        if cached and cached[0] == stamp:
+            return cached[1]
+        
+        with open(yaml_path, "rb") as f:
+            metadata = yaml.load(f, Loader=YamlLoader)
+        
+        self._meta_cache[key] = (stamp, metadata)
+        self._meta_cache_dirty = True
+        return metadata
+    
+    def _build_index(self) -> Dict[str, List[str]]:
+        index_path = self.metadata_path / CATEGORY_INDEX_FILE
+        dir_mtime = self.metadata_path.stat().st_mtime_ns
+        
+        try:
+            with open(index_path, "rb") as f:
+                stored = json_loads(f.read())
+            if stored.get("mtime") == dir_mtime:
+                return stored["categories"]
+        except (OSError, ValueError, KeyError, AttributeError):
+            pass
+        
+        marker = "/atomic/windows/"
+        marker_bytes = marker.encode()
+        index: Dict[str, List[str]] = {}
+        yaml_files = sorted(p for p in self.metadata_path.iterdir() if p.name.endswith(".yaml"))
+        for yaml_file in yaml_files:
+            # Only files that mention the marker can contribute a category, skip parsing the rest
+            if not self._file_contains(yaml_file, marker_bytes):
+                continue
+            metadata = self.load_metadata(yaml_file)
+            categories = set()
+            for f in metadata.get("files", []):
+                link = f.get("link")
+                if link and marker in link:
+                    categories.add(link.split(marker, 1)[1].split("/", 1)[0])
+            for category in categories:
+                index.setdefault(category, []).append(yaml_file.name)
+        
+        try:
+            # Create the index file first so the stamped mtime already accounts for it;
+            # rewriting an existing file does not touch the directory mtime.
+            index_path.touch()
+            dir_mtime = self.metadata_path.stat().st_mtime_ns
+            with open(index_path, "w", encoding="utf-8") as f:
+                json.dump({"mtime": dir_mtime, "categories": index}, f)
+        except OSError as e:
+            logger.warning(f"Could not write category index: {e}")
+        
+        return index
+    
+    @staticmethod
+    def _file_contains(path: Path, needle: bytes) -> bool:
+        with open(path, "rb") as f:
+            size = os.fstat(f.fileno()).st_size
+            if size < MMAP_MIN_SIZE:
+                return needle in f.read()
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                return mm.find(needle) != -1
     
     def extract_expected_techniques(self, metadata: Dict[str, Any]) -> Set[str]:
         techniques = set()
@@ -132,38 +258,60 @@ class DetectionValidator:
                         return full_path
         return None
     
+    def dataset_info(self, yaml_path: Path) -> Tuple[Dict[str, Any], Set[str], Optional[Path]]:
+        metadata = self.load_metadata(yaml_path)
+        key = str(yaml_path)
+        entry = self._meta_cache[key]
+        
+        # A missing data file is looked up again, it may have been fetched since
+        if len(entry) > 2 and entry[2][1] is not None:
+            expected, data_file = entry[2]
+            return metadata, expected, data_file
+        
+        expected = self.extract_expected_techniques(metadata)
+        data_file = self.find_data_file(metadata)
+        if data_file is not None:
+            self._meta_cache[key] = (entry[0], metadata, (expected, data_file))
+            self._meta_cache_dirty = True
+        return metadata, expected, data_file
+    
     def load_events_from_zip(self, zip_path: Path, max_events: int = 1000) -> List[Dict[str, Any]]:
-        events = []
+        if max_events <= 0:
+            return []
+        
+        events: List[Any] = [None] * max_events
+        count = 0
+        loads = json_loads
         
         with zipfile.ZipFile(zip_path, "r") as zf:
             for name in zf.namelist():
                 if name.endswith(".json"):
-                    with zf.open(name) as f:
-                        content = f.read().decode("utf-8")
-                        for line in content.strip().split("\n"):
+                    # Stream the member through a large buffer so inflate runs in big chunks
+                    # and reading stops as soon as max_events is reached. Lines stay bytes;
+                    # both orjson and json parse UTF-8 bytes directly.
+                    with zf.open(name) as raw:
+                        for line in io.BufferedReader(raw, buffer_size=1 << 20):
                             if line.strip():
                                 try:
-                                    event = json.loads(line)
-                                    events.append(event)
-                                    if len(events) >= max_events:
-                                        return events
-                                except json.JSONDecodeError:
+                                    events[count] = loads(line)
+                                except ValueError:
                                     continue
-        return events
+                                count += 1
+                                if count >= max_events:
+                                    return events
+        return events[:count]
     
     async def validate_dataset(self, metadata_path: Path, max_events: int = 10000) -> Optional[ValidationResult]:
-        metadata = self.load_metadata(metadata_path)
+        metadata, expected, data_file = self.dataset_info(metadata_path)
         dataset_id = metadata.get("id", metadata_path.stem)
         dataset_title = metadata.get("title", "Unknown")
         
         logger.info(f"Validating: {dataset_id} - {dataset_title}")
         
-        expected = self.extract_expected_techniques(metadata)
         if not expected:
             logger.warning(f"  No MITRE techniques in metadata, skipping")
             return None
         
-        data_file = self.find_data_file(metadata)
         if not data_file:
             logger.warning(f"  Data file not found, skipping")
             return None
@@ -176,17 +324,25 @@ class DetectionValidator:
         
         detected_techniques: Set[str] = set()
         events_with_alerts = 0
+        events_analyzed = 0
+        stopped_early = False
         
-        for event_data in events:
-            parsed = self.parser.parse_dict(event_data)
-            if not parsed:
-                continue
+        parsed_events = [p for p in map(self.parser.parse_dict, events) if p]
+        
+        for start in range(0, len(parsed_events), ANALYZE_BATCH_SIZE):
+            batch = parsed_events[start:start + ANALYZE_BATCH_SIZE]
+            events_analyzed += len(batch)
+            for detections in await self.engine.analyze_events(batch):
+                if detections:
+                    events_with_alerts += 1
+                    for detection in detections:
+                        detected_techniques.update(detection.mitre_techniques)
             
-            detections = await self.engine.analyze(parsed)
-            if detections:
-                events_with_alerts += 1
-                for detection in detections:
-                    detected_techniques.update(detection.mitre_techniques)
+            if self.early_exit and expected <= detected_techniques:
+                stopped_early = events_analyzed < len(parsed_events)
+                if stopped_early:
+                    logger.info(f"  All expected techniques detected after {events_analyzed} events, stopping early")
+                break
         
         matched = bool(detected_techniques & expected)
         
@@ -197,33 +353,50 @@ class DetectionValidator:
             detected_techniques=detected_techniques,
             total_events=len(events),
             events_with_alerts=events_with_alerts,
-            matched=matched
+            matched=matched,
+            events_analyzed=events_analyzed,
+            stopped_early=stopped_early,
         )
         
         logger.info(f"  Result: {'PASS' if matched else 'FAIL'} | Expected: {expected} | Detected: {detected_techniques}")
         
         return result
     
-    async def validate_category(self, category: str, limit: int = 10) -> ValidationReport:
+    async def validate_category(self, category: str, limit: int = 10, workers: int = 1) -> ValidationReport:
         category_path = self.datasets_path / "datasets" / "atomic" / "windows" / category
         
         if not category_path.exists():
             logger.error(f"Category path not found: {category_path}")
             return self.report
         
-        metadata_files = []
-        for yaml_file in self.metadata_path.glob("*.yaml"):
-            metadata = self.load_metadata(yaml_file)
-            files = metadata.get("files", [])
-            for f in files:
-                link = f.get("link", "")
-                if f"/{category}/" in link:
-                    metadata_files.append(yaml_file)
-                    break
+        index = self._build_index()
+        metadata_files = [self.metadata_path / name for name in index.get(category, [])]
         
         logger.info(f"Found {len(metadata_files)} datasets for category '{category}'")
         
-        for yaml_file in metadata_files[:limit]:
+        metadata_files = metadata_files[:limit]
+        
+        if workers > 1 and len(metadata_files) > 1:
+            # Workers read the metadata cache when they start, so fill and save it first
+            for yaml_file in metadata_files:
+                self.dataset_info(yaml_file)
+            self.save_meta_cache()
+            
+            # Each worker process builds its own engine once and validates whole datasets
+            loop = asyncio.get_running_loop()
+            with ProcessPoolExecutor(
+                max_workers=min(workers, len(metadata_files)),
+                initializer=_init_worker,
+                initargs=(str(self.datasets_path), self.engine.rule_cache_path is not None, self.early_exit),
+            ) as pool:
+                results = await asyncio.gather(*(
+                    loop.run_in_executor(pool, _validate_one, str(yaml_file))
+                    for yaml_file in metadata_files
+                ))
+            self.report.results.extend(r for r in results if r)
+            return self.report
+        
+        for yaml_file in metadata_files:
             result = await self.validate_dataset(yaml_file)
             if result:
                 self.report.results.append(result)
@@ -243,6 +416,18 @@ class DetectionValidator:
         
         return self.report
 
+_worker_validator: Optional[DetectionValidator] = None
+_worker_loop: Optional[asyncio.AbstractEventLoop] = None
+
+def _init_worker(datasets_path: str, rule_cache: bool, early_exit: bool):
+    global _worker_validator, _worker_loop
+    _worker_loop = asyncio.new_event_loop()
+    _worker_validator = DetectionValidator(Path(datasets_path), rule_cache=rule_cache, early_exit=early_exit)
+    _worker_loop.run_until_complete(_worker_validator.initialize())
+
+def _validate_one(yaml_path: str) -> Optional[ValidationResult]:
+    return _worker_loop.run_until_complete(_worker_validator.validate_dataset(Path(yaml_path)))
+
 async def main():
     parser = argparse.ArgumentParser(
         description="Validate IsoLog detection using Security-Datasets"
@@ -269,6 +454,31 @@ async def main():
         default=5,
         help="Max datasets to validate per category"
     )
+    parser.add_argument(
+        "--no-rule-cache",
+        action="store_true",
+        help=f"Always parse Sigma rules instead of reusing {RULE_CACHE_PATH}"
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Validate datasets of a category in this many worker processes"
+    )
+    scan_mode = parser.add_mutually_exclusive_group()
+    scan_mode.add_argument(
+        "--early-exit",
+        dest="early_exit",
+        action="store_true",
+        default=True,
+        help="Stop analyzing a dataset once every expected technique is detected (default)"
+    )
+    scan_mode.add_argument(
+        "--full-scan",
+        dest="early_exit",
+        action="store_false",
+        help="Analyze every loaded event, e.g. to measure alert counts across the dataset"
+    )
     
     args = parser.parse_args()
     
@@ -276,16 +486,21 @@ async def main():
         logger.error(f"Security-Datasets not found at: {args.datasets_path}")
         sys.exit(1)
     
-    validator = DetectionValidator(args.datasets_path)
+    validator = DetectionValidator(
+        args.datasets_path,
+        rule_cache=not args.no_rule_cache,
+        early_exit=args.early_exit,
+    )
     await validator.initialize()
     
     if args.dataset:
         report = await validator.validate_single(args.dataset)
     elif args.category:
-        report = await validator.validate_category(args.category, limit=args.limit)
+        report = await validator.validate_category(args.category, limit=args.limit, workers=args.workers)
     else:
-        report = await validator.validate_category("credential_access", limit=args.limit)
+        report = await validator.validate_category("credential_access", limit=args.limit, workers=args.workers)
     
+    validator.save_meta_cache()
     report.print_summary()
 
 if __name__ == "__main__":
@@ -0,0 +1,13 @@
+
+import pytest
+from fastapi.testclient import TestClient
+
+from backend.api.main import create_app
+
+@pytest.fixture(scope="session")
+def app():
+    return create_app()
+
+@pytest.fixture(scope="session")
+def client(app):
+    return TestClient(app)
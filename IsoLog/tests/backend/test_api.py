@@ -1,16 +1,9 @@
 
-import pytest
-from fastapi.testclient import TestClient
 from unittest.mock import patch, MagicMock
 
 class TestHealthEndpoint:
     
-    def test_health_check(self):
-        from backend.api.main import create_app
-        
-        app = create_app()
-        client = TestClient(app)
-        
+    def test_health_check(self, client):
         response = client.get("/health")
         
         assert response.status_code == 200
@@ -19,12 +12,6 @@ class TestHealthEndpoint:
 
 class TestEventsAPI:
     
-    @pytest.fixture
-    def client(self):
-        from backend.api.main import create_app
-        app = create_app()
-        return TestClient(app)
-    
     def test_get_events_empty(self, client):
         response = client.get("/api/events")
         
@@ -42,12 +29,6 @@ class TestEventsAPI:
 
 class TestAlertsAPI:
     
-    @pytest.fixture
-    def client(self):
-        from backend.api.main import create_app
-        app = create_app()
-        return TestClient(app)
-    
     def test_get_alerts_empty(self, client):
         response = client.get("/api/alerts")
         
@@ -64,12 +45,6 @@ class TestAlertsAPI:
 
 class TestDashboardAPI:
     
-    @pytest.fixture
-    def client(self):
-        from backend.api.main import create_app
-        app = create_app()
-        return TestClient(app)
-    
     def test_get_dashboard_stats(self, client):
         response = client.get("/api/dashboard/stats")
         
@@ -82,12 +57,6 @@ class TestDashboardAPI:
 
 class TestSearchAPI:
     
-    @pytest.fixture
-    def client(self):
-        from backend.api.main import create_app
-        app = create_app()
-        return TestClient(app)
-    
     def test_search_events(self, client):
         response = client.post(
             "/api/search",
@@ -98,12 +67,6 @@ class TestSearchAPI:
 
 class TestSystemAPI:
     
-    @pytest.fixture
-    def client(self):
-        from backend.api.main import create_app
-        app = create_app()
-        return TestClient(app)
-    
     def test_get_system_status(self, client):
         response = client.get("/api/system/status")
         
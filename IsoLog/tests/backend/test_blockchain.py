@@ -40,6 +40,22 @@ class TestHashComputer:
         assert root is not None
         assert len(root) == 64
     
+    def test_compute_merkle_root_odd(self):
+        hashes = [HashComputer.hash_string(f"event{i}") for i in range(5)]
+        
+        root = HashComputer.compute_merkle_root(hashes)
+        
+        assert len(root) == 64
+    
+    def test_compute_merkle_root_blake3(self):
+        pytest.importorskip("blake3")
+        hashes = [HashComputer.hash_string(f"event{i}") for i in range(4)]
+        
+        root = HashComputer.compute_merkle_root(hashes, algo="blake3")
+        
+        assert len(root) == 64
+        assert root != HashComputer.compute_merkle_root(hashes)
+    
     def test_compute_merkle_root_single(self):
         hashes = [HashComputer.hash_string("single")]
         root = HashComputer.compute_merkle_root(hashes)
@@ -1,9 +1,16 @@
 
+import asyncio
+import tempfile
+from datetime import datetime
+from pathlib import Path
+
 import pytest
 from unittest.mock import Mock, patch
 
 from backend.detection.engine import DetectionEngine, Detection
+from backend.detection.anomaly.detector import AnomalyDetector
 from backend.detection.scorer import ThreatScorer
+from backend.parsers.base_parser import ParsedEvent
 
 class TestThreatScorer:
     
@@ -111,6 +118,77 @@ class TestDetectionEngine:
         detections = engine.analyze(event)
         assert isinstance(detections, list)
 
+class TestAnomalyDetector:
+    
+    @pytest.fixture
+    def models_path(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            yield Path(tmpdir)
+    
+    def test_save_model_replaces_file(self, models_path):
+        detector = AnomalyDetector(str(models_path))
+        detector.model = {"version": 1}
+        detector._feature_names = ["a"]
+        asyncio.run(detector._save_model())
+        
+        detector.model = {"version": 2}
+        asyncio.run(detector._save_model())
+        
+        loaded = AnomalyDetector(str(models_path))
+        asyncio.run(loaded.initialize())
+        
+        assert loaded.model == {"version": 2}
+        assert loaded._feature_names == ["a"]
+        assert [p.name for p in models_path.iterdir()] == ["isolation_forest.pkl"]
+
+class TestAnalyzeEvents:
+    
+    @pytest.fixture
+    def events(self):
+        events = []
+        for i in range(300):
+            port = 60000 + i if i % 50 == 0 else 443
+            events.append(ParsedEvent(
+                timestamp=datetime(2024, 1, 15, (i * 7) % 24, 0, 0),
+                source_ip="10.0.0.1",
+                destination_port=port,
+                user_name="admin" if i % 3 else None,
+                process_name="powershell.exe" if i % 25 == 0 else None,
+            ))
+        return events
+    
+    def make_engine(self, models_path):
+        async def match(event):
+            if event.process_name:
+                return [Detection(rule_id="sigma_test", rule_name="Test", severity="high", confidence=0.9)]
+            return []
+        
+        engine = DetectionEngine()
+        engine._sigma_matcher = Mock(match=match)
+        engine._anomaly_detector = AnomalyDetector(str(models_path), threshold=0.55)
+        engine._anomaly_detector._min_training_samples = 100
+        engine._scorer = ThreatScorer()
+        engine._initialized = True
+        return engine
+    
+    def test_batch_matches_single(self, events):
+        with tempfile.TemporaryDirectory() as single_dir, tempfile.TemporaryDirectory() as batch_dir:
+            single = self.make_engine(single_dir)
+            batch = self.make_engine(batch_dir)
+            
+            async def run():
+                per_event = [await single.analyze(event) for event in events]
+                batched = []
+                for i in range(0, len(events), 64):
+                    batched.extend(await batch.analyze_events(events[i:i + 64]))
+                return per_event, batched
+            
+            per_event, batched = asyncio.run(run())
+        
+        assert any(d.detection_type == "ml" for ds in batched for d in ds)
+        assert any(d.rule_id == "sigma_test" for ds in batched for d in ds)
+        assert batched == per_event
+
 class TestDetection:
     
     def test_detection_creation(self):
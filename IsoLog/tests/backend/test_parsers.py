@@ -11,7 +11,7 @@ from backend.parsers.formats.firewall import FirewallParser
 
 class TestLinuxSyslogParser:
     
-    @pytest.fixture
+    @pytest.fixture(scope="module")
     def parser(self):
         return LinuxSyslogParser()
     
@@ -52,7 +52,7 @@ class TestLinuxSyslogParser:
 
 class TestJSONParser:
     
-    @pytest.fixture
+    @pytest.fixture(scope="module")
     def parser(self):
         return JSONGenericParser()
     
@@ -80,7 +80,7 @@ class TestJSONParser:
 
 class TestCSVParser:
     
-    @pytest.fixture
+    @pytest.fixture(scope="module")
     def parser(self):
         return CSVGenericParser()
     
@@ -96,7 +96,7 @@ class TestCSVParser:
 
 class TestWindowsEventParser:
     
-    @pytest.fixture
+    @pytest.fixture(scope="module")
     def parser(self):
         return WindowsEventParser()
     
@@ -113,7 +113,7 @@ class TestWindowsEventParser:
 
 class TestFirewallParser:
     
-    @pytest.fixture
+    @pytest.fixture(scope="module")
     def parser(self):
         return FirewallParser()
     
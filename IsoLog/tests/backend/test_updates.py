@@ -0,0 +1,192 @@
+
+import json
+import pytest
+import tarfile
+import tempfile
+from pathlib import Path
+from unittest.mock import Mock
+
+from backend.updates.bundle import UpdateBundle
+from backend.updates.manager import UpdateManager
+from backend.updates.verifier import UpdateVerifier
+from scripts.build_update_package import sign_package
+
+class TestUpdateBackups:
+    
+    @pytest.fixture
+    def manager(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            root = Path(tmpdir)
+            (root / "rules").mkdir()
+            (root / "rules" / "rule.yml").write_text("old rule")
+            (root / "models").mkdir()
+            (root / "models" / "isolation_forest.pkl").write_bytes(b"old model")
+            
+            yield UpdateManager(
+                rules_path=str(root / "rules"),
+                models_path=str(root / "models"),
+                backup_path=str(root / "backups"),
+            )
+    
+    def test_backup_survives_in_place_write(self, manager):
+        backup = Path(manager._create_backup()["path"])
+        
+        with open(manager.models_path / "isolation_forest.pkl", "wb") as f:
+            f.write(b"retrained model")
+        
+        assert (backup / "models" / "isolation_forest.pkl").read_bytes() == b"old model"
+        assert (backup / "sigma_rules" / "rule.yml").read_text() == "old rule"
+    
+    def test_second_backup_keeps_first(self, manager):
+        first = Path(manager._create_backup()["path"])
+        
+        source = manager.backup_path.parent / "update"
+        source.mkdir()
+        (source / "rule.yml").write_text("new rule")
+        manager._apply_sigma_rules(source)
+        
+        second = Path(manager._create_backup()["path"])
+        
+        assert first != second
+        assert (first / "sigma_rules" / "rule.yml").read_text() == "old rule"
+        assert (second / "sigma_rules" / "rule.yml").read_text() == "new rule"
+
+    def test_symlinked_rule_dir_survives_restore(self, manager):
+        external = manager.backup_path.parent / "ext"
+        external.mkdir()
+        (external / "community.yml").write_text("community rule")
+        (manager.rules_path / "community").symlink_to(external, target_is_directory=True)
+        
+        backup = Path(manager._create_backup()["path"])
+        manager._restore_backup(str(backup))
+        
+        assert (backup / "sigma_rules" / "community" / "community.yml").read_text() == "community rule"
+        assert (manager.rules_path / "community" / "community.yml").read_text() == "community rule"
+        assert (manager.rules_path / "rule.yml").read_text() == "old rule"
+
+def build_bundle(root: Path, entries) -> str:
+    bundle_dir = root / "bundle_src" / "isolog_update_test"
+    contents = []
+    for i, (content_type, files) in enumerate(entries):
+        entry_dir = bundle_dir / f"entry{i}"
+        entry_dir.mkdir(parents=True)
+        for name, text in files.items():
+            (entry_dir / name).write_text(text)
+        contents.append({"type": content_type, "path": f"entry{i}"})
+    (bundle_dir / "manifest.json").write_text(json.dumps({"contents": contents}))
+    
+    archive_path = root / "update.tar.gz"
+    with tarfile.open(archive_path, "w:gz") as tar:
+        tar.add(bundle_dir, arcname=bundle_dir.name)
+    return str(archive_path)
+
+class TestApplyUpdate:
+    
+    @pytest.fixture
+    def root(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            root = Path(tmpdir)
+            (root / "rules").mkdir()
+            (root / "rules" / "rule.yml").write_text("old rule")
+            yield root
+    
+    @pytest.fixture
+    def manager(self, root):
+        return UpdateManager(
+            rules_path=str(root / "rules"),
+            models_path=str(root / "models"),
+            backup_path=str(root / "backups"),
+        )
+    
+    def test_same_type_entries_apply_in_order(self, root, manager):
+        bundle = build_bundle(root, [
+            ("sigma_rules", {"rule.yml": "first", "extra.yml": "extra"}),
+            ("sigma_rules", {"rule.yml": "second", "extra.yml": "extra"}),
+        ])
+        
+        result = manager.apply_update(bundle, skip_verification=True)
+        
+        assert result["success"]
+        assert [(c["new"], c["updated"], c["skipped"]) for c in result["changes"]] == [(1, 1, 0), (0, 1, 1)]
+        assert (manager.rules_path / "rule.yml").read_text() == "second"
+    
+    def test_changes_keep_manifest_order(self, root, manager):
+        bundle = build_bundle(root, [
+            ("sigma_rules", {"rule.yml": "first"}),
+            ("models", {"model.pkl": "model"}),
+            ("sigma_rules", {"rule.yml": "second"}),
+        ])
+        
+        result = manager.apply_update(bundle, skip_verification=True)
+        
+        assert result["success"]
+        assert [c["type"] for c in result["changes"]] == ["sigma_rules", "models", "sigma_rules"]
+    
+    def test_failure_stops_remaining_entries(self, root, manager):
+        failing = Mock(side_effect=RuntimeError("boom"))
+        manager._appliers["sigma_rules"] = failing
+        bundle = build_bundle(root, [
+            ("sigma_rules", {"rule.yml": "first"}),
+            ("sigma_rules", {"rule.yml": "second"}),
+        ])
+        
+        result = manager.apply_update(bundle, skip_verification=True)
+        
+        assert not result["success"]
+        assert failing.call_count == 1
+        assert result["restored_from_backup"]
+        assert (manager.rules_path / "rule.yml").read_text() == "old rule"
+
+class TestBundleSignature:
+    
+    @pytest.fixture
+    def signed_env(self):
+        pytest.importorskip("cryptography")
+        from cryptography.hazmat.primitives import serialization
+        
+        with tempfile.TemporaryDirectory() as tmpdir:
+            root = Path(tmpdir)
+            (root / "rules").mkdir()
+            (root / "rules" / "rule.yml").write_text("title: test")
+            
+            keys = UpdateVerifier.generate_keypair(str(root / "keys"))
+            with open(keys["private_key"], "rb") as f:
+                private_key = serialization.load_pem_private_key(f.read(), password=None)
+            
+            bundle_path = UpdateBundle().create(str(root / "out"), sigma_rules_path=str(root / "rules"))
+            
+            yield {
+                "bundle": Path(bundle_path),
+                "private_key_path": keys["private_key"],
+                "private_key": private_key,
+                "verifier": UpdateVerifier(keys["public_key"]),
+            }
+    
+    def test_digest_signature_round_trip(self, signed_env):
+        sign_package(str(signed_env["bundle"]), signed_env["private_key_path"])
+        
+        result = signed_env["verifier"].verify_bundle(str(signed_env["bundle"]))
+        
+        assert result["signature_valid"] is True
+        assert result["valid"] is True
+    
+    def test_legacy_raw_signature_round_trip(self, signed_env):
+        bundle = signed_env["bundle"]
+        signature = signed_env["private_key"].sign(bundle.read_bytes())
+        bundle.with_suffix(".sig").write_bytes(signature)
+        
+        result = signed_env["verifier"].verify_bundle(str(bundle))
+        
+        assert result["signature_valid"] is True
+    
+    def test_tampered_bundle_fails(self, signed_env):
+        bundle = signed_env["bundle"]
+        sign_package(str(bundle), signed_env["private_key_path"])
+        
+        with open(bundle, "ab") as f:
+            f.write(b"\0")
+        
+        result = signed_env["verifier"].verify_bundle(str(bundle))
+        
+        assert result["signature_valid"] is False
+        assert result["valid"] is False
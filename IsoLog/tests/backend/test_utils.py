@@ -0,0 +1,84 @@
+
+import enum
+import math
+from datetime import datetime, timedelta
+
+import pytest
+
+from backend.utils.helpers import parse_timestamp, safe_json_dumps, safe_json_loads
+
+class TestSafeJson:
+    
+    def test_loads_keeps_big_integers(self):
+        data = safe_json_loads('{"a": 123456789012345678901234567890}')
+        
+        assert data == {"a": 123456789012345678901234567890}
+    
+    def test_loads_accepts_nan(self):
+        data = safe_json_loads('{"a": NaN}')
+        
+        assert math.isnan(data["a"])
+    
+    def test_loads_invalid_returns_default(self):
+        assert safe_json_loads("{not json", default={}) == {}
+        assert safe_json_loads(None) is None
+    
+    def test_dumps_format(self):
+        class Color(enum.Enum):
+            RED = "red"
+        
+        assert safe_json_dumps({"a": 1, "b": [1, 2]}) == '{"a": 1, "b": [1, 2]}'
+        assert safe_json_dumps({"c": Color.RED}) == '{"c": "Color.RED"}'
+        assert safe_json_dumps({"n": float("nan")}) == '{"n": NaN}'
+        assert safe_json_dumps({"i": 2 ** 70}) == '{"i": 1180591620717411303424}'
+
+class TestParseTimestamp:
+    
+    @pytest.mark.parametrize("value,expected", [
+        ("2024-01-15T10:30:00.123456Z", datetime(2024, 1, 15, 10, 30, 0, 123456)),
+        ("2024-01-15T10:30:00Z", datetime(2024, 1, 15, 10, 30, 0)),
+        ("2024-01-15 10:30:00.25", datetime(2024, 1, 15, 10, 30, 0, 250000)),
+        ("2024-01-15 10:30:00", datetime(2024, 1, 15, 10, 30, 0)),
+        ("2024-1-5 1:2:3", datetime(2024, 1, 5, 1, 2, 3)),
+    ])
+    def test_naive_formats(self, value, expected):
+        result = parse_timestamp(value)
+        
+        assert result == expected
+        assert result.tzinfo is None
+    
+    @pytest.mark.parametrize("value,offset", [
+        ("2024-01-15T10:30:00.5+02:00", timedelta(hours=2)),
+        ("2024-01-15T10:30:00+0530", timedelta(hours=5, minutes=30)),
+        ("2024-01-15T10:30:00-05:00", -timedelta(hours=5)),
+        ("2024-01-15T10:30:00+053045", timedelta(hours=5, minutes=30, seconds=45)),
+        ("2024-01-15T10:30:00-05:30:45.5", -timedelta(hours=5, minutes=30, seconds=45, microseconds=500000)),
+    ])
+    def test_offset_formats(self, value, offset):
+        result = parse_timestamp(value)
+        
+        assert result.replace(tzinfo=None, microsecond=0) == datetime(2024, 1, 15, 10, 30, 0)
+        assert result.utcoffset() == offset
+    
+    @pytest.mark.parametrize("value,month,day", [
+        ("Jan  5 10:30:00", 1, 5),
+        ("Jan 15 10:30:00", 1, 15),
+        ("dec 31 23:59:59", 12, 31),
+    ])
+    def test_syslog_uses_current_year(self, value, month, day):
+        result = parse_timestamp(value)
+        
+        assert (result.month, result.day) == (month, day)
+        assert result.year == datetime.now().year
+    
+    @pytest.mark.parametrize("value", [
+        "",
+        "not a timestamp",
+        "2024-13-01 00:00:00",
+        "2024-01-15T24:00:00Z",
+        "2024-01-15T10:30:00+05:3045",
+        "2024-01-15T10:30:00+05:60",
+        "Foo  5 10:30:00",
+    ])
+    def test_invalid_returns_none(self, value):
+        assert parse_timestamp(value) is None